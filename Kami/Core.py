@@ -16,6 +16,7 @@ from .EntityEmbedding import EntityEmbedding
 from .Visualisation import Visualise
 from .Forecast import Forecast
 from .Helper import Helper
+from .Rollup import Rollup
 from datetime import datetime
 from sklearn.preprocessing import LabelEncoder
 sys.setrecursionlimit(10000)
@@ -23,10 +24,13 @@ os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
 
 class Kami(Preprocess, Visualise, Forecast):
 	'''Main module'''
-	def __init__(self, input_f_path, output_dir_path, cache_dir_path, sales_as_label = True, weekly_agg = False, deployment_mode = False, n_1 = 2048, n_2 = 1024, n_3 = 512, n_4 = 256, n_5 = 128, dropout = False, output_activation = 'relu', err_func = 'mean_squared_error', optimizer = 'adam', epochs = 50, patience = 5, batch_size = 1024, n_sample = 500000, n_ensemble = 3, val_split_ratio = 0.95, save_embeddings = True, saved_embeddings_fname = 'embeddings.pickle', *args, **kwargs):
+	def __init__(self, input_f_path, output_dir_path, cache_dir_path, sales_as_label = True, weekly_agg = False, deployment_mode = False, n_1 = 2048, n_2 = 1024, n_3 = 512, n_4 = 256, n_5 = 128, dropout = False, output_activation = 'relu', err_func = 'mean_squared_error', optimizer = 'adam', epochs = 50, patience = 5, batch_size = 1024, n_sample = 500000, n_ensemble = 3, val_split_ratio = 0.95, save_embeddings = True, saved_embeddings_fname = 'embeddings.pickle', granularity = None, *args, **kwargs):
 		'''Initiate local variables'''
-		Preprocess.__init__(self, input_f_path, cache_dir_path)
-		Visualise.__init__(self, output_dir_path, cache_dir_path)
+		self.granularity = granularity if granularity != None else ('weekly' if weekly_agg else 'daily')
+		if self.granularity not in ['daily', 'weekly', 'monthly']:
+			raise ValueError('Model can only be trained on daily, weekly or monthly data as other rollups lack product level features')
+		Preprocess.__init__(self, input_f_path, cache_dir_path, granularities = [self.granularity])
+		Visualise.__init__(self, output_dir_path, cache_dir_path, granularity = self.granularity)
 		Forecast.__init__(self, output_dir_path, cache_dir_path)
 		self.r_train, self.r_val = 0, 0
 		self.input_f_path, self.cache_dir_path, self.output_dir_path, self.weekly_agg, self.deployment_mode = self.input_f_path, cache_dir_path, output_dir_path, weekly_agg, deployment_mode
@@ -36,11 +40,10 @@ class Kami(Preprocess, Visualise, Forecast):
 	def __repr__(self):
 		return 'Please assign an object to store the instance'
 
-	def extract_csv(self, cache_dir_path, weekly_agg):
+	def extract_csv(self, cache_dir_path, granularity):
 		'''Convert cached csv files into dictionary-like objects'''
-		train_path = (cache_dir_path + 'train.csv') if not weekly_agg else (cache_dir_path + 'train_weekly.csv')
-		test_path = (cache_dir_path + 'test.csv') if not weekly_agg else (cache_dir_path + 'test_weekly.csv')
-		df_path = (cache_dir_path + 'df.csv') if not weekly_agg else (cache_dir_path + 'df_weekly.csv')
+		suffix = Rollup.csv_suffix(granularity)
+		train_path, test_path, df_path = cache_dir_path + 'train' + suffix + '.csv', cache_dir_path + 'test' + suffix + '.csv', cache_dir_path + 'df' + suffix + '.csv'
 		with open(train_path) as csv_train, open(test_path) as csv_test, open(df_path) as csv_df:
 			train, test, df = csv.reader(csv_train, delimiter = ','), csv.reader(csv_test, delimiter = ','), csv.reader(csv_df, delimiter = ',')
 			with open(cache_dir_path + 'train.pickle', 'wb') as f_train, open(cache_dir_path + 'test.pickle', 'wb') as f_test, open(cache_dir_path + 'df.pickle', 'wb') as f_df:
@@ -129,7 +132,7 @@ class Kami(Preprocess, Visualise, Forecast):
 		if n_sample == None:
 			n_sample = self.n_sample
 		print('{0:*^80}'.format('Sales Forecast with Entity Embedding Model Initiated'))
-		self.extract_csv(self.cache_dir_path, weekly_agg = self.weekly_agg)
+		self.extract_csv(self.cache_dir_path, granularity = self.granularity)
 		self.prep_features(self.cache_dir_path, target_label = self.target_label, deployment_mode = self.deployment_mode)
 		models = self.train_model(self.cache_dir_path, self.output_dir_path, self.deployment_mode, self.n_1, self.n_2, self.n_3, self.n_4, self.n_5, self.dropout, self.output_activation, self.err_func, self.optimizer, self.epochs, self.patience, self.batch_size, n_sample, self.n_ensemble, self.val_split_ratio, self.save_embeddings, self.saved_embeddings_fname)
 		if not self.deployment_mode:
@@ -0,0 +1,109 @@
+'''
+This script builds a cosine similarity index over learned store and product embeddings for query time lookups
+'''
+
+# Import libraries
+import os
+import time
+import pickle
+import numpy as np
+
+class EmbeddingIndex:
+	'''Main module'''
+	def __init__(self, cache_dir_path, kind = 'product', block_size = 4096, use_mmap = False, index_fname = None):
+		'''Initiate settings and build or load the index'''
+		self.cache_dir_path, self.kind, self.block_size, self.use_mmap = cache_dir_path, kind, block_size, use_mmap
+		self.index_fname = (kind + '_embedding_index.npy') if index_fname == None else index_fname
+		self.load_label_encoders(cache_dir_path)
+		self.index = None
+		if use_mmap and Aux.index_is_current(cache_dir_path, self.index_fname):
+			self.load_index(cache_dir_path, self.index_fname)
+		if self.index is None or len(self.index) != len(self.le.classes_):
+			self.load_embeddings(cache_dir_path)
+			self.index = Aux.normalise(self.embedding[:len(self.le.classes_)])
+			if use_mmap:
+				self.save_index(cache_dir_path, self.index_fname)
+				self.load_index(cache_dir_path, self.index_fname)
+
+	def __repr__(self):
+		return 'Please assign an object to store the instance'
+
+	def load_embeddings(self, cache_dir_path):
+		'''Load the embedding matrix saved after training'''
+		with open(cache_dir_path + 'embeddings.pickle', 'rb') as f:
+			store_embedding, product_embedding, dow_embedding, dom_embedding, year_embedding, month_embedding = pickle.load(f)
+		self.embedding = store_embedding if self.kind == 'store' else product_embedding
+
+	def load_label_encoders(self, cache_dir_path):
+		'''Load the label encoder mapping names to embedding rows'''
+		with open(cache_dir_path + 'les.pickle', 'rb') as f:
+			les = pickle.load(f)
+		self.le = les[0] if self.kind == 'store' else les[1]
+		self.labels = np.asarray(self.le.classes_)
+		self.label_rows = {label: i for i, label in enumerate(self.labels.tolist())}
+
+	def save_index(self, cache_dir_path, index_fname):
+		'''Export the normalised matrix so later sessions can memory-map it'''
+		np.save(cache_dir_path + index_fname, self.index)
+
+	def load_index(self, cache_dir_path, index_fname):
+		'''Memory-map a previously exported index instead of holding it in RAM'''
+		self.index = np.load(cache_dir_path + index_fname, mmap_mode = 'r')
+
+	def query(self, names, k = 10, exclude_self = True):
+		'''Return the k most similar labels and their cosine similarities for each queried name, in the order queried'''
+		names = [names] if isinstance(names, str) else list(names)
+		unknown = [name for name in names if name not in self.label_rows]
+		if unknown:
+			raise ValueError('Unknown ' + self.kind + ' names: ' + ', '.join(map(str, unknown)))
+		rows = np.array([self.label_rows[name] for name in names], dtype = np.int64)
+		indices, scores = Aux.top_k(np.ascontiguousarray(self.index[rows]), self.index, k, self.block_size, rows if exclude_self else None)
+		return [list(zip(self.labels[idx].tolist(), score.tolist())) for idx, score in zip(indices, scores)]
+
+	def benchmark(self, n_queries = 1000, k = 10, batch_size = 256, seed = 0):
+		'''Measure batched query throughput in queries per second'''
+		rows = np.random.RandomState(seed).randint(len(self.labels), size = n_queries)
+		start = time.perf_counter()
+		for i in range(0, n_queries, batch_size):
+			batch = rows[i:i + batch_size]
+			Aux.top_k(np.ascontiguousarray(self.index[batch]), self.index, k, self.block_size, batch)
+		elapsed = time.perf_counter() - start
+		qps = n_queries / elapsed if elapsed > 0 else float('inf')
+		print('{0:*^80}'.format('Embedding Index Throughput:'))
+		print('{0:*^80}'.format('{:.1f} queries/sec'.format(qps)))
+		return qps
+
+class Aux:
+	'''Auxiliary module to reduce code clutters'''
+	def index_is_current(cache_dir_path, index_fname):
+		'''Check that an exported index exists and is not older than the embeddings it was built from'''
+		index_path, embeddings_path = cache_dir_path + index_fname, cache_dir_path + 'embeddings.pickle'
+		return os.path.exists(index_path) and os.path.getmtime(index_path) >= os.path.getmtime(embeddings_path)
+
+	def normalise(matrix):
+		'''L2-normalise rows into a contiguous float32 matrix'''
+		matrix = np.asarray(matrix, dtype = np.float32)
+		norms = np.linalg.norm(matrix, axis = 1, keepdims = True)
+		norms[norms == 0] = 1
+		return np.ascontiguousarray(matrix / norms, dtype = np.float32)
+
+	def top_k(queries, index, k, block_size, exclude_rows = None):
+		'''Scan the index in row blocks and keep a running top-k per query'''
+		n_query, n_index = queries.shape[0], index.shape[0]
+		k = min(k, n_index - (1 if exclude_rows is not None else 0))
+		best_idx = np.empty((n_query, 0), dtype = np.int64)
+		best_score = np.empty((n_query, 0), dtype = np.float32)
+		for start in range(0, n_index, block_size):
+			block = np.asarray(index[start:start + block_size])
+			scores = queries @ block.T
+			if exclude_rows is not None:
+				hit = (exclude_rows >= start) & (exclude_rows < start + block.shape[0])
+				scores[np.nonzero(hit)[0], exclude_rows[hit] - start] = -np.inf
+			cand_idx = np.hstack((best_idx, np.broadcast_to(np.arange(start, start + block.shape[0]), scores.shape)))
+			cand_score = np.hstack((best_score, scores))
+			if cand_score.shape[1] > k:
+				keep = np.argpartition(-cand_score, k - 1, axis = 1)[:, :k]
+				cand_idx, cand_score = np.take_along_axis(cand_idx, keep, axis = 1), np.take_along_axis(cand_score, keep, axis = 1)
+			best_idx, best_score = cand_idx, cand_score
+		order = np.argsort(-best_score, axis = 1)
+		return np.take_along_axis(best_idx, order, axis = 1), np.take_along_axis(best_score, order, axis = 1)
@@ -6,14 +6,15 @@ This script prepares raw data to be analysed by neural network later
 import numpy as np
 import pandas as pd
 import os
+from .Rollup import Rollup
 
 class Preprocess:
 	'''Main module'''
-	def __init__(self, input_f_path, cache_dir_path, split_ratio = 0.95, cols_renames = {'description': 'product', 'day_of_the_week_monday_is_0': 'day_of_week', 'total_average_sell': 'price', 'total_net_sales': 'sales'}):
+	def __init__(self, input_f_path, cache_dir_path, split_ratio = 0.95, cols_renames = {'description': 'product', 'day_of_the_week_monday_is_0': 'day_of_week', 'total_average_sell': 'price', 'total_net_sales': 'sales'}, granularities = ['daily']):
 		'''Initiate settings'''
 		pd.options.mode.chained_assignment = None
 		self.cols_renames, self.cache_dir_path = cols_renames, cache_dir_path
-		self.input_f_path, self.split_ratio = input_f_path, split_ratio
+		self.input_f_path, self.split_ratio, self.granularities = input_f_path, split_ratio, granularities
 
 	def __repr__(self):
 		return 'Please assign an object to store the instance'
@@ -24,16 +25,24 @@ class Preprocess:
 
 	def data_clean(self, df, cache_dir_path, split_ratio, cols_renames):
 		'''Convert data into the required format'''
-		self.train, self.test, self.train_weekly, self.test_weekly, self.df, self.df_weekly = Aux.clean_product_data(df = df, split_ratio = split_ratio, cols_renames = cols_renames)
+		self.rollup = Rollup(cache_dir_path, base = Aux.clean_product_data(df = df, cols_renames = cols_renames))
 
-	def shutdown(self, cache_dir_path):
-		'''Export results as the final step'''
-		self.train.to_csv(cache_dir_path + 'train.csv', index = False)
-		self.test.to_csv(cache_dir_path + 'test.csv', index = False)
-		self.train_weekly.to_csv(cache_dir_path + 'train_weekly.csv', index = False)
-		self.test_weekly.to_csv(cache_dir_path + 'test_weekly.csv', index = False)
-		self.df.to_csv(cache_dir_path + 'df.csv', index = False)
-		self.df_weekly.to_csv(cache_dir_path + 'df_weekly.csv', index = False)
+	def data_append(self, df, cache_dir_path, cols_renames):
+		'''Merge newly arrived days into the cached daily base table'''
+		if not os.path.exists(cache_dir_path + 'daily_base.pickle'):
+			raise FileNotFoundError('No cached daily base table in ' + cache_dir_path + ', please run Preprocess() before Update()')
+		self.rollup = Rollup(cache_dir_path)
+		self.rollup.append(Aux.clean_product_data(df = df, cols_renames = cols_renames))
+
+	def shutdown(self, cache_dir_path, split_ratio, granularities):
+		'''Export only the requested granularities as the final step'''
+		for granularity in granularities:
+			train, test, df = self.rollup.split(granularity, split_ratio)
+			suffix = Rollup.csv_suffix(granularity)
+			train.to_csv(cache_dir_path + 'train' + suffix + '.csv', index = False)
+			test.to_csv(cache_dir_path + 'test' + suffix + '.csv', index = False)
+			df.to_csv(cache_dir_path + 'df' + suffix + '.csv', index = False)
+		self.rollup.save()
 
 	def Preprocess(self):
 		print('{0:*^80}'.format('Importing Raw Data'))
@@ -41,12 +50,21 @@ class Preprocess:
 		print('{0:*^80}'.format('Cleaning Raw Data'))
 		self.data_clean(df = self.df_raw, cache_dir_path = self.cache_dir_path, split_ratio = self.split_ratio, cols_renames = self.cols_renames)
 		print('{0:*^80}'.format('Exporting Cleaned Data'))
-		self.shutdown(cache_dir_path = self.cache_dir_path)
+		self.shutdown(cache_dir_path = self.cache_dir_path, split_ratio = self.split_ratio, granularities = self.granularities)
 		print('{0:*^80}'.format('Preprocessing Completed'))
 
+	def Update(self, input_f_path):
+		print('{0:*^80}'.format('Importing New Data'))
+		self.data_import(input_f_path = input_f_path)
+		print('{0:*^80}'.format('Merging New Data into Cached Rollups'))
+		self.data_append(df = self.df_raw, cache_dir_path = self.cache_dir_path, cols_renames = self.cols_renames)
+		print('{0:*^80}'.format('Exporting Cleaned Data'))
+		self.shutdown(cache_dir_path = self.cache_dir_path, split_ratio = self.split_ratio, granularities = self.granularities)
+		print('{0:*^80}'.format('Update Completed'))
+
 class Aux:
 	'''Axuliary module to structure the code'''
-	def clean_product_data(df, split_ratio, cols_renames, cols_drop = ['date.1', 'week_of_year']):
+	def clean_product_data(df, cols_renames, cols_drop = ['date.1', 'week_of_year']):
 		'''Specialise in cleaning sales data segmented by store and product'''
 		# Clean auxiliary arrays
 		df.columns = Helper.clean_col_names(columns = df.columns)
@@ -62,14 +80,11 @@ class Aux:
 		df.loc[:, 'date'] = pd.to_datetime(df['date'])
 		df.loc[:, 'quantity'] = df['sales']/df['price']
 
-		# Re-order and split modified data
+		# Re-order modified data, coarser granularities are rolled up on demand
 		df = df.set_index(['date', 'store', 'product']).sort_index(ascending = True)
-		df_weekly = df.groupby([pd.Grouper(level = 'date', freq = 'W'), pd.Grouper(level = 'store'), pd.Grouper(level = 'product')]).agg({'sales': 'sum', 'price': 'mean', 'quantity': 'sum', 'day_of_week': 'first', 'day_of_month': 'first', 'month': 'first'})
-		df.reset_index(inplace = True), df_weekly.reset_index(inplace = True)
-		train, test = df.iloc[:round(float(len(df) * split_ratio)), :], df.iloc[round(float(len(df) * split_ratio)):, :]
-		train_weekly, test_weekly = df_weekly.iloc[:round(float(len(df_weekly) * split_ratio)), :], df_weekly.iloc[round(float(len(df_weekly) * split_ratio)):, :]
+		df.reset_index(inplace = True)
 
-		return train, test, train_weekly, test_weekly, df, df_weekly
+		return df
 
 class Helper:
 	'''Standalone helper function to further reduce clutter'''
@@ -0,0 +1,100 @@
+'''
+This script keeps a compact daily base table and materialises coarser rollups of it only when they are requested
+'''
+
+# Import libraries
+import os
+import glob
+import pandas as pd
+
+class Rollup:
+	'''Main module'''
+	granularities = ['daily', 'weekly', 'monthly', 'store']
+	keys = ['date', 'store', 'product']
+
+	def __init__(self, cache_dir_path, base = None):
+		'''Wrap a freshly cleaned daily table, or reload the base and its cached rollups from a previous run'''
+		self.cache_dir_path, self.rollups, self.reuse_cache = cache_dir_path, {}, base is None
+		if base is None:
+			base = pd.read_pickle(cache_dir_path + 'daily_base.pickle')
+		else:
+			[os.remove(f_path) for f_path in glob.glob(cache_dir_path + 'rollup_*.pickle')]
+		self.base = Aux.compact(base).sort_values(self.keys).reset_index(drop = True)
+
+	def __repr__(self):
+		return 'Please assign an object to store the instance'
+
+	def get(self, granularity):
+		'''Return a rollup, computing it on first request and caching it afterwards'''
+		if granularity not in self.granularities:
+			raise ValueError('Unknown granularity ' + str(granularity) + ', expected one of ' + ', '.join(self.granularities))
+		if granularity == 'daily':
+			return self.base
+		if granularity not in self.rollups:
+			f_path = self.cache_dir_path + 'rollup_' + granularity + '.pickle'
+			self.rollups[granularity] = pd.read_pickle(f_path) if self.reuse_cache and os.path.exists(f_path) else Aux.aggregate(self.base, granularity)
+		return self.rollups[granularity]
+
+	def append(self, df_new):
+		'''Merge newly arrived days into the base and rebuild only the periods they touch'''
+		df_new = Aux.compact(df_new)
+		base = pd.concat([self.base, df_new], ignore_index = True)
+		self.base = Aux.compact(base.drop_duplicates(subset = self.keys, keep = 'last')).sort_values(self.keys).reset_index(drop = True)
+		for granularity in self.granularities[1:]:
+			if self.reuse_cache and os.path.exists(self.cache_dir_path + 'rollup_' + granularity + '.pickle'):
+				self.get(granularity)
+		for granularity, rollup in self.rollups.items():
+			labels = Aux.period_labels(df_new['date'], granularity).unique()
+			affected = self.base.loc[Aux.period_labels(self.base['date'], granularity).isin(labels), :]
+			rollup = rollup.loc[~rollup['date'].isin(labels), :]
+			self.rollups[granularity] = pd.concat([rollup, Aux.aggregate(affected, granularity)], ignore_index = True).sort_values(Aux.group_keys(granularity)).reset_index(drop = True)
+
+	def split(self, granularity, split_ratio):
+		'''Split a rollup chronologically into train and test portions'''
+		df = self.get(granularity)
+		n_train = round(float(len(df) * split_ratio))
+		return df.iloc[:n_train, :], df.iloc[n_train:, :], df
+
+	def save(self):
+		'''Persist the base table and every rollup materialised so far'''
+		self.base.to_pickle(self.cache_dir_path + 'daily_base.pickle')
+		for granularity, rollup in self.rollups.items():
+			rollup.to_pickle(self.cache_dir_path + 'rollup_' + granularity + '.pickle')
+
+	def csv_suffix(granularity):
+		'''File name suffix used for exported csv files of a granularity'''
+		return '' if granularity == 'daily' else '_' + granularity
+
+class Aux:
+	'''Auxiliary module to reduce code clutters'''
+	aggs = {'sales': 'sum', 'price': 'mean', 'quantity': 'sum', 'day_of_week': 'first', 'day_of_month': 'first', 'month': 'first'}
+	freqs = {'weekly': 'W', 'monthly': 'M'}
+
+	def compact(df):
+		'''Store identifiers as categories and calendar fields as small integers'''
+		df = df.copy()
+		df['date'] = pd.to_datetime(df['date'])
+		for col in ['store', 'product']:
+			df[col] = df[col].astype(str).astype('category')
+		for col in ['day_of_week', 'day_of_month', 'month']:
+			df[col] = df[col].astype('int8')
+		return df
+
+	def group_keys(granularity):
+		return ['date', 'store'] if granularity == 'store' else Rollup.keys
+
+	def period_labels(dates, granularity):
+		'''Label each date with the end date of the period it rolls up into'''
+		if granularity in Aux.freqs:
+			return dates.dt.to_period(Aux.freqs[granularity]).dt.end_time.dt.normalize()
+		return dates
+
+	def aggregate(df, granularity):
+		'''Aggregate daily records into one row per period and key'''
+		aggs = {col: agg for col, agg in Aux.aggs.items() if not (granularity == 'store' and col == 'price')}
+		df = df.assign(date = Aux.period_labels(df['date'], granularity))
+		df = df.groupby(Aux.group_keys(granularity), observed = True, sort = True).agg(aggs).reset_index()
+		for col in ['store', 'product']:
+			if col in df.columns:
+				df[col] = df[col].astype(str)
+		return df
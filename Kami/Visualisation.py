@@ -9,6 +9,7 @@ import numpy as np
 from sklearn import manifold
 import pandas as pd
 import matplotlib.pyplot as plt
+from .Rollup import Rollup
 
 class Vis2:
 	'''Secondary module'''
@@ -38,8 +39,9 @@ class Vis2:
 
 class Visualise(Vis2):
 	'''Main module'''
-	def __init__(self, output_dir_path, cache_dir_path, sub_dir = None):
+	def __init__(self, output_dir_path, cache_dir_path, sub_dir = None, granularity = 'daily'):
 		super().__init__(output_dir_path, cache_dir_path)
+		self.granularity = granularity
 		self.merged = pd.DataFrame()
 		self.product_dict = {}
 		self.output_dir_path, self.cache_dir_path = output_dir_path, cache_dir_path
@@ -55,7 +57,7 @@ class Visualise(Vis2):
 
 	def preprocess(self, cache_dir_path, output_dir_path):
 		'''Preprocess data for plotting'''
-		test = pd.read_csv(cache_dir_path + 'test.csv', index_col = False)
+		test = pd.read_csv(cache_dir_path + 'test' + Rollup.csv_suffix(self.granularity) + '.csv', index_col = False)
 		test_predicted = pd.read_csv(cache_dir_path + 'test_predicted.csv', index_col = False)
 		print(test['product'].value_counts()[:50])
 		self.merged = pd.DataFrame({'date': test['date'],
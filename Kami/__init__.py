@@ -1 +1,2 @@
 from .Core import Kami
+from .EmbeddingIndex import EmbeddingIndex